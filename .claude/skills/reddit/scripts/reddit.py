@@ -1,33 +1,145 @@
 #!/usr/bin/env python3
-"""Fetch Reddit posts from the command line."""
+"""Fetch Reddit posts from the command line.
+
+Requires urllib3 and orjson (``pip install urllib3 orjson``).
+"""
 
 import argparse
-import json
-import urllib.request
+import contextlib
+import functools
+import gzip
+import hashlib
+import os
+import tempfile
+import time
+import urllib.parse
 import sys
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+
+import orjson
+import urllib3
+
+# Shared pool so repeated requests to reddit.com reuse a keep-alive connection.
+# block=True makes fetch_many's worker threads wait for a free socket rather
+# than opening throwaway connections past maxsize.
+_HTTP = urllib3.PoolManager(
+    maxsize=16,
+    block=True,
+    headers={
+        "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7)",
+        "Accept-Encoding": "gzip, deflate",
+    },
+    timeout=10,
+)
+
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "hiveminer-reddit")
+
+
+def disk_cache(ttl: int):
+    """Cache a URL fetcher's decoded JSON as gzip files under CACHE_DIR.
+
+    Entries are keyed by a hash of the URL and reused for ttl seconds. Only
+    results the fetcher decoded successfully are stored, and an entry that
+    can't be read back or parsed counts as a miss. The wrapped function
+    gains a use_cache keyword to bypass the cache.
+    """
+    def decorator(fetch):
+        @functools.wraps(fetch)
+        def wrapper(url: str, use_cache: bool = True) -> dict:
+            if not use_cache:
+                return fetch(url)
+            path = os.path.join(CACHE_DIR, hashlib.blake2b(url.encode(), digest_size=16).hexdigest() + ".json.gz")
+            try:
+                if time.time() - os.path.getmtime(path) < ttl:
+                    with gzip.open(path, "rb") as f:
+                        return orjson.loads(f.read())
+            except FileNotFoundError:
+                pass
+            except (OSError, EOFError, zlib.error, orjson.JSONDecodeError):
+                # Unreadable entry: drop it so this fetch rewrites it.
+                with contextlib.suppress(OSError):
+                    os.unlink(path)
+            data = fetch(url)
+            # Write to a temp file and rename so concurrent fetch_many workers
+            # never read a half-written entry. A cache that can't be written
+            # shouldn't fail the fetch.
+            tmp = None
+            try:
+                os.makedirs(CACHE_DIR, exist_ok=True)
+                fd, tmp = tempfile.mkstemp(dir=CACHE_DIR, suffix=".tmp")
+                with os.fdopen(fd, "wb") as raw, gzip.GzipFile(fileobj=raw, mode="wb") as f:
+                    f.write(orjson.dumps(data))
+                os.replace(tmp, path)
+            except OSError:
+                if tmp is not None:
+                    with contextlib.suppress(OSError):
+                        os.unlink(tmp)
+            return data
+        return wrapper
+    return decorator
+
+
+def _get(url: str) -> bytearray:
+    """GET a URL through the shared pool and return the response body.
+
+    The body is streamed into a single buffer so gzip is decoded chunk by
+    chunk rather than holding the whole compressed and decoded copies at once.
+    """
+    resp = _HTTP.request("GET", url, preload_content=False)
+    try:
+        if resp.status >= 400:
+            resp.drain_conn()
+            raise urllib3.exceptions.HTTPError(f"HTTP {resp.status} for {url}")
+        body = bytearray()
+        for chunk in resp.stream(65536):
+            body += chunk
+        return body
+    finally:
+        resp.release_conn()
+
+
+@disk_cache(ttl=3600)
+def _get_json(url: str) -> dict:
+    """GET a URL and decode the JSON body; raises before caching if it doesn't parse."""
+    return orjson.loads(_get(url))
+
+
+def subreddit_url(subreddit: str, sort: str = "hot", limit: int = 10) -> str:
+    """Build the listing URL for a subreddit."""
+    return f"https://www.reddit.com/r/{subreddit}/{sort}.json?limit={limit}"
+
+
+def search_url(query: str, subreddit: str = "all", limit: int = 10) -> str:
+    """Build the search URL for a query within a subreddit."""
+    encoded_query = urllib.parse.quote(query)
+    return f"https://www.reddit.com/r/{subreddit}/search.json?q={encoded_query}&limit={limit}&restrict_sr=1"
 
 
-def fetch_subreddit(subreddit: str, sort: str = "hot", limit: int = 10) -> dict:
+def fetch_subreddit(subreddit: str, sort: str = "hot", limit: int = 10, use_cache: bool = True) -> dict:
     """Fetch posts from a subreddit."""
-    url = f"https://www.reddit.com/r/{subreddit}/{sort}.json?limit={limit}"
-    req = urllib.request.Request(
-        url,
-        headers={"User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7)"}
-    )
-    with urllib.request.urlopen(req, timeout=10) as response:
-        return json.loads(response.read().decode())
+    return _get_json(subreddit_url(subreddit, sort, limit), use_cache)
 
 
-def fetch_search(query: str, subreddit: str = "all", limit: int = 10) -> dict:
+def fetch_search(query: str, subreddit: str = "all", limit: int = 10, use_cache: bool = True) -> dict:
     """Search Reddit for posts."""
-    encoded_query = urllib.parse.quote(query)
-    url = f"https://www.reddit.com/r/{subreddit}/search.json?q={encoded_query}&limit={limit}&restrict_sr=1"
-    req = urllib.request.Request(
-        url,
-        headers={"User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7)"}
-    )
-    with urllib.request.urlopen(req, timeout=10) as response:
-        return json.loads(response.read().decode())
+    return _get_json(search_url(query, subreddit, limit), use_cache)
+
+
+def fetch_many(urls: list[str], max_workers: int = 8, use_cache: bool = True) -> list:
+    """Fetch several listing/search URLs concurrently, preserving order.
+
+    A URL that fails gets its exception in its slot instead of a dict, so one
+    rate-limited or missing subreddit doesn't discard the rest of the batch.
+    """
+    def fetch(url: str):
+        try:
+            return _get_json(url, use_cache=use_cache)
+        except Exception as e:
+            return e
+
+    with ThreadPoolExecutor(max_workers=max_workers) as ex:
+        return list(ex.map(fetch, urls))
 
 
 def display_posts(data: dict, title: str):
@@ -53,8 +165,6 @@ def display_posts(data: dict, title: str):
 
 
 def main():
-    import urllib.parse
-
     parser = argparse.ArgumentParser(description="Browse Reddit from the command line")
     subparsers = parser.add_subparsers(dest="command", help="Commands")
 
@@ -63,20 +173,34 @@ def main():
     list_parser.add_argument("subreddit", nargs="?", default="programming", help="Subreddit name (default: programming)")
     list_parser.add_argument("--sort", "-s", choices=["hot", "new", "top", "rising", "controversial"], default="hot", help="Sort method")
     list_parser.add_argument("--limit", "-l", type=int, default=10, help="Number of posts")
+    list_parser.add_argument("--parallel", "-p", metavar="SUBS", help="Comma-separated subreddits to fetch concurrently (overrides subreddit)")
+    list_parser.add_argument("--no-cache", action="store_true", help="Bypass the on-disk response cache")
 
     # Search command
     search_parser = subparsers.add_parser("search", help="Search Reddit")
     search_parser.add_argument("query", help="Search query")
     search_parser.add_argument("--subreddit", "-r", default="all", help="Subreddit to search in (default: all)")
     search_parser.add_argument("--limit", "-l", type=int, default=10, help="Number of results")
+    search_parser.add_argument("--no-cache", action="store_true", help="Bypass the on-disk response cache")
 
     args = parser.parse_args()
 
-    if args.command == "ls":
-        data = fetch_subreddit(args.subreddit, args.sort, args.limit)
+    if args.command == "ls" and args.parallel:
+        subreddits = [s.strip() for s in args.parallel.split(",") if s.strip()]
+        if not subreddits:
+            list_parser.error("--parallel needs at least one subreddit")
+        urls = [subreddit_url(s, args.sort, args.limit) for s in subreddits]
+        results = fetch_many(urls, use_cache=not args.no_cache)
+        for subreddit, data in zip(subreddits, results):
+            if isinstance(data, Exception):
+                print(f"\n⚠️  r/{subreddit}: {data}", file=sys.stderr)
+                continue
+            display_posts(data, f"📋 r/{subreddit} ({args.sort})")
+    elif args.command == "ls":
+        data = fetch_subreddit(args.subreddit, args.sort, args.limit, use_cache=not args.no_cache)
         display_posts(data, f"📋 r/{args.subreddit} ({args.sort})")
     elif args.command == "search":
-        data = fetch_search(args.query, args.subreddit, args.limit)
+        data = fetch_search(args.query, args.subreddit, args.limit, use_cache=not args.no_cache)
         display_posts(data, f"🔍 Search: '{args.query}' in r/{args.subreddit}")
     else:
         parser.print_help()